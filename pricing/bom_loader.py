@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import csv
 import io
+import sys
 from typing import Iterable, List
 
 from .domain_models import BomItem
@@ -15,19 +16,22 @@ class BomCsvError(Exception):
 REQUIRED_COLUMNS = {"product_code", "part_name", "quantity", "unit_price_usd"}
 
 
-def _normalize_file(file_obj: Iterable[bytes] | Iterable[str]) -> io.StringIO:
-    """Return a text stream for the uploaded file."""
-    if hasattr(file_obj, "read"):
-        content = file_obj.read()
-    else:
-        content = b"".join(file_obj)  # type: ignore[arg-type]
+def _normalize_file(file_obj: Iterable[bytes] | Iterable[str]) -> Iterable[str]:
+    """Return a line-by-line text stream for the uploaded file.
 
-    if isinstance(content, bytes):
-        text = content.decode("utf-8")
-    else:
-        text = content
+    Binary file objects are wrapped in a ``TextIOWrapper`` so the CSV
+    reader pulls lines as it parses instead of materializing the whole
+    upload in memory; text file objects are used as-is.
+    """
+    if hasattr(file_obj, "read"):
+        if isinstance(file_obj.read(0), bytes):
+            return io.TextIOWrapper(file_obj, encoding="utf-8", newline="")
+        return file_obj
 
-    return io.StringIO(text)
+    # Plain iterables of raw lines are decoded lazily.
+    return (
+        line.decode("utf-8") if isinstance(line, bytes) else line for line in file_obj
+    )
 
 
 def load_bom_from_csv(file_obj: Iterable[bytes] | Iterable[str]) -> List[BomItem]:
@@ -38,22 +42,32 @@ def load_bom_from_csv(file_obj: Iterable[bytes] | Iterable[str]) -> List[BomItem
     """
 
     text_stream = _normalize_file(file_obj)
-    reader = csv.DictReader(text_stream)
+    reader = csv.reader(text_stream)
 
-    if reader.fieldnames is None or not REQUIRED_COLUMNS.issubset({name.strip() for name in reader.fieldnames}):
+    header = next(reader, None)
+    column_index = {name.strip(): i for i, name in enumerate(header or [])}
+    if header is None or not REQUIRED_COLUMNS.issubset(column_index):
         raise BomCsvError(
             "CSV is missing required columns: product_code, part_name, quantity, unit_price_usd"
         )
 
+    code_idx = column_index["product_code"]
+    part_idx = column_index["part_name"]
+    quantity_idx = column_index["quantity"]
+    price_idx = column_index["unit_price_usd"]
+
     bom_items: list[BomItem] = []
     for line_number, row in enumerate(reader, start=2):
-        try:
-            product_code = (row.get("product_code") or "").strip()
-            part_name = (row.get("part_name") or "").strip()
-            quantity_raw = row.get("quantity")
-            unit_price_raw = row.get("unit_price_usd")
-        except AttributeError as exc:  # pragma: no cover - defensive
-            raise BomCsvError("Invalid CSV row format") from exc
+        if not row:
+            continue
+
+        num_cells = len(row)
+        # Interned so BOMs with many repeated codes/names share one string
+        # object per distinct value.
+        product_code = sys.intern((row[code_idx] if code_idx < num_cells else "").strip())
+        part_name = sys.intern((row[part_idx] if part_idx < num_cells else "").strip())
+        quantity_raw = row[quantity_idx] if quantity_idx < num_cells else None
+        unit_price_raw = row[price_idx] if price_idx < num_cells else None
 
         if not product_code or not part_name:
             raise BomCsvError(f"Row {line_number}: product_code and part_name are required")
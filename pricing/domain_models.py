@@ -4,14 +4,14 @@ from dataclasses import dataclass
 from .ml.demand_elasticity import ElasticityResult
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProductInfo:
     product_name: str
     product_code: str
     category: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ManufacturingParams:
     smd_cost_per_component: int  # IRR
     tht_cost_per_component: int  # IRR
@@ -20,7 +20,7 @@ class ManufacturingParams:
     worker_hour_cost: int  # IRR
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LogisticsParams:
     shipping_cost_usd: float
     custom_clearance_irr: int
@@ -28,26 +28,26 @@ class LogisticsParams:
     exchange_rate_buy: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InventoryParams:
     inventory_days: int
     capital_cost_rate: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketParams:
     competitor_price_avg: int
     elasticity: float | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FinanceParams:
     exchange_rate_now: int
     target_margin_percent: float
     competitor_price_avg: float = 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BomItem:
     product_code: str
     part_name: str
@@ -55,7 +55,7 @@ class BomItem:
     unit_price_usd: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostBreakdown:
     bom_cost_irr: float
     assembly_cost_irr: float
@@ -74,7 +74,7 @@ class CostBreakdown:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioResult:
     exchange_rate: int
     total_cost_irr: float
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import pickle
 import re
 from dataclasses import dataclass
@@ -11,12 +12,18 @@ import pandas as pd
 
 MODELS_DIR = Path(__file__).resolve().parent / "models"
 
+# Greedy + already collapses runs, so one substitution pass suffices.
+_NON_ALNUM_RUN = re.compile(r"[^a-z0-9]+")
+
 
 @dataclass
 class LinearTimeModel:
     slope: float
     intercept: float
     last_month: str
+    # Numeric value of last_month + 1, precomputed at train time so the
+    # prediction hot path avoids pandas Period construction entirely.
+    next_numeric: float | None = None
 
     def predict(self, month_numeric: float) -> float:
         return self.slope * month_numeric + self.intercept
@@ -29,9 +36,7 @@ def _require_columns(df: pd.DataFrame, required: set[str]) -> None:
 
 
 def _slugify(value: str) -> str:
-    value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9]+", "-", value)
-    value = re.sub(r"-+", "-", value).strip("-")
+    value = _NON_ALNUM_RUN.sub("-", value.strip().lower()).strip("-")
     return value or "component"
 
 
@@ -40,17 +45,36 @@ def _period_to_numeric(period: pd.Period) -> float:
     return timestamp.timestamp()
 
 
+def _months_to_numeric(months: pd.Series) -> np.ndarray:
+    """Vectorized equivalent of mapping ``_period_to_numeric`` over months."""
+
+    return pd.PeriodIndex(months).to_timestamp().as_unit("s").asi8.astype(np.float64)
+
+
 def _fit_linear_model(months: pd.Series, prices: pd.Series) -> LinearTimeModel:
-    month_numeric = months.apply(_period_to_numeric).to_numpy()
+    month_numeric = _months_to_numeric(months)
     price_values = prices.to_numpy()
 
     if len(month_numeric) == 1:
         slope = 0.0
         intercept = float(price_values[0])
     else:
-        slope, intercept = np.polyfit(month_numeric, price_values, deg=1)
-
-    return LinearTimeModel(slope=float(slope), intercept=float(intercept), last_month=str(months.iloc[-1]))
+        # Closed-form univariate regression: b = cov(x, y) / var(x),
+        # a = mean(y) - b * mean(x); avoids polyfit's SVD machinery.
+        x_mean = month_numeric.mean()
+        y_mean = price_values.mean()
+        x_centered = month_numeric - x_mean
+        y_centered = price_values - y_mean
+        slope = (x_centered @ y_centered) / (x_centered @ x_centered)
+        intercept = y_mean - slope * x_mean
+
+    last_month = months.iloc[-1]
+    return LinearTimeModel(
+        slope=float(slope),
+        intercept=float(intercept),
+        last_month=str(last_month),
+        next_numeric=_period_to_numeric(last_month + 1),
+    )
 
 
 def train_from_csv(csv_path: str) -> None:
@@ -66,38 +90,55 @@ def train_from_csv(csv_path: str) -> None:
 
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
-    for part_name, part_df in data.groupby("part_name"):
-        monthly = (
-            part_df.assign(month=part_df["date"].dt.to_period("M"))
-            .groupby("month")["unit_price_usd"]
-            .mean()
-            .sort_index()
-        )
+    # One vectorized aggregation for all parts instead of a per-part
+    # assign/groupby pass inside the loop.
+    data["month"] = data["date"].dt.to_period("M")
+    monthly = (
+        data.groupby(["part_name", "month"])["unit_price_usd"].mean().sort_index()
+    )
 
-        if monthly.empty:
+    for part_name, part_series in monthly.groupby(level=0):
+        if part_series.empty:
             continue
 
-        model = _fit_linear_model(monthly.index.to_series(), monthly.reset_index(drop=True))
+        months = (
+            part_series.index.get_level_values("month").to_series().reset_index(drop=True)
+        )
+        model = _fit_linear_model(months, part_series.reset_index(drop=True))
         model_path = MODELS_DIR / f"{_slugify(part_name)}.pkl"
         with model_path.open("wb") as f:
             pickle.dump(model.__dict__, f)
 
 
+@functools.lru_cache(maxsize=512)
+def _load_model(slug: str, mtime_ns: int) -> LinearTimeModel:
+    """Unpickle a trained model; cached per (slug, file mtime)."""
+
+    model_path = MODELS_DIR / f"{slug}.pkl"
+    with model_path.open("rb") as f:
+        raw_data: Dict[str, object] = pickle.load(f)
+
+    return LinearTimeModel(**raw_data)
+
+
 def predict_next_month(part_name: str) -> float:
     """
     Load the trained model for the given part and return the predicted
     ``unit_price_usd`` for next month.
+
+    Models are cached in memory keyed by part slug and file mtime, so hot
+    parts skip the pickle round-trip after the first call.
     """
 
-    model_path = MODELS_DIR / f"{_slugify(part_name)}.pkl"
+    slug = _slugify(part_name)
+    model_path = MODELS_DIR / f"{slug}.pkl"
     if not model_path.exists():
         raise FileNotFoundError(f"No trained model found for part '{part_name}'")
 
-    with model_path.open("rb") as f:
-        raw_data: Dict[str, object] = pickle.load(f)
+    model = _load_model(slug, model_path.stat().st_mtime_ns)
 
-    model = LinearTimeModel(**raw_data)
-    last_month = pd.Period(model.last_month)
-    next_month = last_month + 1
-    next_month_numeric = _period_to_numeric(next_month)
+    next_month_numeric = model.next_numeric
+    if next_month_numeric is None:
+        # Older pickles predate the precomputed value.
+        next_month_numeric = _period_to_numeric(pd.Period(model.last_month) + 1)
     return float(model.predict(next_month_numeric))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
@@ -9,13 +10,17 @@ import numpy as np
 from pricing.services.sales_csv_loader import SalesRecord
 
 
-@dataclass
+@dataclass(slots=True)
 class ElasticityModel:
     product_code: str
     a: float  # intercept in log-log space
     b: float  # slope = elasticity
     r2: float
     avg_price: float
+    stderr_b: float = 0.0
+    b_raw: float = 0.0
+    regularization_strength: float = 0.0
+    elasticity_bounds: Tuple[float, float] | None = None
 
 
 @dataclass
@@ -48,27 +53,24 @@ def _fit_log_log_ridge(
     Returns:
         a, b, r2, stderr_b
     """
-    xs: List[float] = []
-    ys: List[float] = []
-
-    for rec in records:
-        if rec.price <= 0 or rec.units_sold <= 0:
-            continue
-        xs.append(math.log(rec.price))
-        ys.append(math.log(rec.units_sold))
+    prices = np.array([rec.price for rec in records], dtype=np.float64)
+    units = np.array([rec.units_sold for rec in records], dtype=np.float64)
+    valid = (prices > 0) & (units > 0)
 
-    if len(xs) < 3:
+    if int(valid.sum()) < 3:
         raise ValueError("Not enough valid sales points to fit elasticity (need >= 3).")
 
-    X = np.column_stack([np.ones(len(xs)), np.array(xs)])
-    y = np.array(ys)
+    xs = np.log(prices[valid])
+    ys = np.log(units[valid])
 
-    # Ridge: (X^T X + λI)^{-1} X^T y
+    X = np.column_stack([np.ones_like(xs), xs])
+    y = ys
+
+    # Ridge: solve (X^T X + λI) coeff = X^T y instead of forming the inverse
     lam = float(regularization_strength)
-    I = np.eye(X.shape[1])
-    XtX = X.T @ X
-    XtX_reg = XtX + lam * I
-    coeff = np.linalg.inv(XtX_reg) @ X.T @ y
+    Xt = X.T
+    XtX_reg = Xt @ X + lam * np.eye(X.shape[1])
+    coeff = np.linalg.solve(XtX_reg, Xt @ y)
 
     a = float(coeff[0])
     b = float(coeff[1])
@@ -80,11 +82,13 @@ def _fit_log_log_ridge(
     ss_res = float(((y - y_pred) ** 2).sum())
     r2 = 1.0 - ss_res / ss_tot if ss_tot > 0 else 0.0
 
-    # Estimate stderr of slope b (approximate)
+    # Estimate stderr of slope b (approximate); XtX_reg is 2x2, so invert
+    # the slope entry in closed form by determinant instead of via LAPACK.
     dof = max(len(y) - 2, 1)
     sigma2 = ss_res / dof if dof > 0 else 0.0
-    cov = sigma2 * np.linalg.inv(XtX_reg)
-    stderr_b = float(math.sqrt(max(cov[1, 1], 0.0)))
+    det = float(XtX_reg[0, 0] * XtX_reg[1, 1] - XtX_reg[0, 1] * XtX_reg[1, 0])
+    cov_bb = sigma2 * XtX_reg[0, 0] / det if det != 0 else 0.0
+    stderr_b = float(math.sqrt(max(cov_bb, 0.0)))
 
     return a, b, r2, stderr_b
 
@@ -107,19 +111,17 @@ def fit_elasticity_for_product(
         np.mean([rec.price for rec in records if rec.price > 0])
     )
 
-    model = ElasticityModel(
+    return ElasticityModel(
         product_code=records[0].product_code,
         a=a,
         b=b_clamped,
         r2=r2,
         avg_price=avg_price,
+        stderr_b=stderr_b,
+        b_raw=b_raw,
+        regularization_strength=regularization_strength,
+        elasticity_bounds=elasticity_bounds,
     )
-    # Attach extra info on model for later CI:
-    model._stderr_b = stderr_b  # type: ignore[attr-defined]
-    model._b_raw = b_raw  # type: ignore[attr-defined]
-    model._regularization_strength = regularization_strength  # type: ignore[attr-defined]
-    model._elasticity_bounds = elasticity_bounds  # type: ignore[attr-defined]
-    return model
 
 
 def compute_optimal_price(
@@ -135,39 +137,27 @@ def compute_optimal_price(
     p_max = 1.5 * model.avg_price
     price_grid = np.linspace(p_min, p_max, num_points)
 
-    profits: List[float] = []
-    units_list: List[float] = []
+    log_prices = np.log(price_grid)
+    units = np.exp(model.a + model.b * log_prices)
+    profits = (price_grid - cost_per_unit) * units
 
-    for p in price_grid:
-        log_q = model.a + model.b * math.log(p)
-        q = math.exp(log_q)
-        profit = (p - cost_per_unit) * q
-        units_list.append(q)
-        profits.append(profit)
-
-    max_idx = int(np.argmax(profits))
+    max_idx = int(profits.argmax())
     optimal_price = float(price_grid[max_idx])
     max_profit = float(profits[max_idx])
-    predicted_units = float(units_list[max_idx])
+    predicted_units = float(units[max_idx])
     all_negative = max_profit < 0
 
     # --- Elasticity CI (approximate 95%) ---
-    stderr_b = getattr(model, "_stderr_b", 0.0)
-    b_raw = getattr(model, "_b_raw", model.b)
     z = 1.96  # approx for 95% CI
-    b_low = b_raw - z * stderr_b
-    b_high = b_raw + z * stderr_b
+    b_low = model.b_raw - z * model.stderr_b
+    b_high = model.b_raw + z * model.stderr_b
     elasticity_ci = (float(b_low), float(b_high))
 
     # --- Price CI: region where profit >= 90% of max Profit ---
     threshold = max_profit * 0.9
-    candidate_prices = [
-        float(p)
-        for p, prof in zip(price_grid, profits)
-        if prof >= threshold
-    ]
-    if candidate_prices:
-        price_ci = (min(candidate_prices), max(candidate_prices))
+    candidate_prices = price_grid[profits >= threshold]
+    if candidate_prices.size:
+        price_ci = (float(candidate_prices.min()), float(candidate_prices.max()))
     else:
         price_ci = (optimal_price, optimal_price)
 
@@ -183,18 +173,10 @@ def compute_optimal_price(
 
     # --- Price sensitivity surface over cost factors ---
     cost_factors = [0.9, 1.0, 1.1, 1.2]
-    sensitivity_matrix: List[List[float]] = []
-    for f in cost_factors:
-        row: List[float] = []
-        effective_cost = cost_per_unit * f
-        for p in price_grid:
-            log_q = model.a + model.b * math.log(p)
-            q = math.exp(log_q)
-            prof = (p - effective_cost) * q
-            row.append(float(prof))
-        sensitivity_matrix.append(row)
-
-    regularization_strength = getattr(model, "_regularization_strength", 0.0)
+    effective_costs = cost_per_unit * np.asarray(cost_factors)
+    sensitivity_matrix = (
+        (price_grid[None, :] - effective_costs[:, None]) * units[None, :]
+    ).tolist()
 
     return ElasticityResult(
         product_code=model.product_code,
@@ -202,31 +184,52 @@ def compute_optimal_price(
         optimal_price=optimal_price,
         predicted_units_at_optimal=predicted_units,
         max_profit=max_profit,
-        price_grid=[float(p) for p in price_grid],
-        profit_grid=[float(v) for v in profits],
+        price_grid=price_grid.tolist(),
+        profit_grid=profits.tolist(),
         elasticity_ci=elasticity_ci,
         optimal_price_ci=price_ci,
         confidence_level=confidence,
-        regularized=bool(regularization_strength),
-        regularization_strength=regularization_strength,
-        elasticity_bounds=getattr(model, "_elasticity_bounds", None),
+        regularized=bool(model.regularization_strength),
+        regularization_strength=model.regularization_strength,
+        elasticity_bounds=model.elasticity_bounds,
         cost_factors=cost_factors,
         sensitivity_matrix=sensitivity_matrix,
         all_negative=all_negative,
     )
 
 
+def _fit_one(
+    args: Tuple[str, List[SalesRecord], float],
+) -> Tuple[str, ElasticityResult | None]:
+    """Fit a single product; worker for the per-product pool."""
+    code, recs, cost_per_unit = args
+    try:
+        model = fit_elasticity_for_product(recs)
+        return code, compute_optimal_price(model, cost_per_unit=cost_per_unit)
+    except Exception:
+        return code, None
+
+
 def train_elasticity_from_mapping(
     sales_mapping: Dict[str, List[SalesRecord]],
     cost_per_unit: float,
 ) -> Dict[str, ElasticityResult]:
-    """Fit elasticity for each product_code and return a mapping of results."""
+    """Fit elasticity for each product_code and return a mapping of results.
+
+    Products are independent, so large catalogs are fanned out across a
+    process pool; small mappings stay on the serial path to avoid pool
+    start-up overhead.
+    """
+    items = [(code, recs, cost_per_unit) for code, recs in sales_mapping.items()]
     results: Dict[str, ElasticityResult] = {}
-    for code, recs in sales_mapping.items():
-        try:
-            model = fit_elasticity_for_product(recs)
-            result = compute_optimal_price(model, cost_per_unit=cost_per_unit)
-        except Exception:
-            continue
-        results[code] = result
+
+    if len(items) <= 4:
+        fitted = map(_fit_one, items)
+    else:
+        with ProcessPoolExecutor() as executor:
+            fitted = list(executor.map(_fit_one, items, chunksize=16))
+
+    for code, result in fitted:
+        if result is not None:
+            results[code] = result
     return results
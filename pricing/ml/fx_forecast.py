@@ -22,12 +22,13 @@ class FxForecastResult:
     r2: float
 
 
-def fit_linear_trend(points: List[FxHistoryPoint]) -> Tuple[float, float, float]:
+def fit_linear_trend(points: List[FxHistoryPoint]) -> Tuple[float, float, float, float]:
     """
     Fit a linear model: rate = intercept + slope * t
     where t is days since the first observation.
 
-    Returns (intercept, slope, r2).
+    Returns (intercept, slope, r2, sigma) where sigma is the residual
+    standard deviation, so callers do not have to refit to get it.
     """
     if len(points) < 5:
         raise ValueError("Need at least 5 FX points to fit a trend.")
@@ -49,7 +50,10 @@ def fit_linear_trend(points: List[FxHistoryPoint]) -> Tuple[float, float, float]
     ss_res = float(((y_vals - y_pred) ** 2).sum())
     r2 = 1.0 - ss_res / ss_tot if ss_tot > 0 else 0.0
 
-    return intercept, slope, r2
+    dof = max(len(y_vals) - 2, 1)
+    sigma = (ss_res / dof) ** 0.5
+
+    return intercept, slope, r2, sigma
 
 
 def forecast_fx(
@@ -65,18 +69,9 @@ def forecast_fx(
     if horizon_days <= 0:
         raise ValueError("horizon_days must be positive.")
 
-    intercept, slope, r2 = fit_linear_trend(points)
+    intercept, slope, r2, sigma = fit_linear_trend(points)
 
     base_date = points[0].date
-    t_hist = np.array([(p.date - base_date).days for p in points], dtype=float)
-    y_hist = np.array([p.rate for p in points], dtype=float)
-
-    # Residual variance for CI
-    X_hist = np.column_stack([np.ones_like(t_hist), t_hist])
-    y_pred_hist = X_hist @ np.array([intercept, slope])
-    ss_res = float(((y_hist - y_pred_hist) ** 2).sum())
-    dof = max(len(y_hist) - 2, 1)
-    sigma = (ss_res / dof) ** 0.5 if dof > 0 else 0.0
 
     # History arrays
     history_dates = [p.date for p in points]
@@ -90,15 +85,12 @@ def forecast_fx(
     forecast_dates: List[dt.date] = [
         last_date + dt.timedelta(days=int(i)) for i in range(1, horizon_days + 1)
     ]
-    forecast_rates: List[float] = []
-    forecast_low: List[float] = []
-    forecast_high: List[float] = []
-
-    for t in t_forecast:
-        y_hat = intercept + slope * t
-        forecast_rates.append(float(y_hat))
-        forecast_low.append(float(y_hat - ci_z * sigma))
-        forecast_high.append(float(y_hat + ci_z * sigma))
+
+    y_hat = intercept + slope * t_forecast
+    ci_width = ci_z * sigma
+    forecast_rates: List[float] = y_hat.tolist()
+    forecast_low: List[float] = (y_hat - ci_width).tolist()
+    forecast_high: List[float] = (y_hat + ci_width).tolist()
 
     return FxForecastResult(
         history_dates=history_dates,
@@ -1,7 +1,9 @@
 """Core pricing calculations."""
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, NamedTuple
+
+import numpy as np
 
 from .domain_models import (
     BomItem,
@@ -15,16 +17,37 @@ from .domain_models import (
 from .ml.demand_elasticity import ElasticityResult
 
 
+class BomArrays(NamedTuple):
+    """BOM quantities and unit prices as parallel NumPy arrays."""
+
+    quantity: np.ndarray
+    unit_price_usd: np.ndarray
+
+
+def build_bom_arrays(bom_items: Iterable[BomItem]) -> BomArrays:
+    """Convert BOM items into arrays suitable for vectorized cost math."""
+
+    items = list(bom_items)
+    return BomArrays(
+        quantity=np.array([item.quantity for item in items], dtype=np.int64),
+        unit_price_usd=np.array(
+            [item.unit_price_usd for item in items], dtype=np.float64
+        ),
+    )
+
+
 def compute_cost_breakdown(
-    bom_items: Iterable[BomItem],
+    bom_items: Iterable[BomItem] | BomArrays,
     manufacturing: ManufacturingParams,
     logistics: LogisticsParams,
     inventory: InventoryParams,
 ) -> CostBreakdown:
     """Compute cost components based on inputs."""
 
-    total_components = sum(item.quantity for item in bom_items)
-    bom_cost_usd = sum(item.quantity * item.unit_price_usd for item in bom_items)
+    bom_arrays = bom_items if isinstance(bom_items, BomArrays) else build_bom_arrays(bom_items)
+
+    total_components = int(bom_arrays.quantity.sum())
+    bom_cost_usd = float(bom_arrays.quantity @ bom_arrays.unit_price_usd)
     bom_cost_irr = bom_cost_usd * logistics.exchange_rate_buy
 
     assembly_cost_irr = total_components * (
@@ -125,7 +148,7 @@ def choose_final_price(
 
 
 def simulate_prices_for_exchange_rates(
-    bom_items: Iterable[BomItem],
+    bom_items: Iterable[BomItem] | BomArrays,
     exchange_rates: Iterable[int],
     *,
     manufacturing: ManufacturingParams,
@@ -133,48 +156,59 @@ def simulate_prices_for_exchange_rates(
     inventory: InventoryParams,
     finance: FinanceParams,
 ) -> list[ScenarioResult]:
-    """Run price simulations for different exchange rates."""
+    """Run price simulations for different exchange rates.
 
-    results: list[ScenarioResult] = []
+    The only rate-dependent cost terms scale linearly with the exchange
+    rate, so the whole sweep is computed with vectorized NumPy instead of
+    re-running the cost pipeline per rate.
+    """
 
-    for rate in exchange_rates:
-        logistics_at_rate = LogisticsParams(
-            shipping_cost_usd=logistics.shipping_cost_usd,
-            custom_clearance_irr=logistics.custom_clearance_irr,
-            duty_percent=logistics.duty_percent,
-            exchange_rate_buy=rate,
-        )
+    bom_arrays = bom_items if isinstance(bom_items, BomArrays) else build_bom_arrays(bom_items)
+    rates = np.asarray(list(exchange_rates), dtype=np.int64)
 
-        finance_at_rate = FinanceParams(
-            exchange_rate_now=rate,
-            target_margin_percent=finance.target_margin_percent,
-            competitor_price_avg=getattr(finance, "competitor_price_avg", 0),
-        )
+    bom_cost_usd = float(bom_arrays.quantity @ bom_arrays.unit_price_usd)
+    total_components = int(bom_arrays.quantity.sum())
 
-        cost_breakdown = compute_cost_breakdown(
-            bom_items=bom_items,
-            manufacturing=manufacturing,
-            logistics=logistics_at_rate,
-            inventory=inventory,
-        )
+    assembly_cost_irr = total_components * (
+        manufacturing.smd_cost_per_component + manufacturing.tht_cost_per_component
+    )
+    labor_cost_irr = (
+        (manufacturing.assembly_time_min + manufacturing.qc_test_time_min) / 60
+    ) * manufacturing.worker_hour_cost
+    duty_frac = logistics.duty_percent / 100
+    inventory_frac = (inventory.inventory_days / 365) * (inventory.capital_cost_rate / 100)
+    competitor_anchor = getattr(finance, "competitor_price_avg", 0) or 0
 
-        recommended_price_data = compute_recommended_price(
-            cost_breakdown=cost_breakdown,
-            finance=finance_at_rate,
-        )
+    bom_cost_irr = bom_cost_usd * rates
+    logistics_cost_irr = (
+        logistics.shipping_cost_usd * rates
+        + logistics.custom_clearance_irr
+        + duty_frac * bom_cost_irr
+    )
+    inventory_cost_irr = bom_cost_irr * inventory_frac
+    total_cost_irr = (
+        bom_cost_irr
+        + assembly_cost_irr
+        + labor_cost_irr
+        + logistics_cost_irr
+        + inventory_cost_irr
+    )
+    recommended_price_irr = np.maximum(
+        total_cost_irr * (1 + finance.target_margin_percent / 100),
+        competitor_anchor,
+    )
 
-        results.append(
-                ScenarioResult(
-                    exchange_rate=rate,
-                    total_cost_irr=cost_breakdown.total_cost_irr,
-                    recommended_price_irr=recommended_price_data["final_suggested_price"],
-                )
+    return [
+        ScenarioResult(rate, cost, price)
+        for rate, cost, price in zip(
+            rates.tolist(), total_cost_irr.tolist(), recommended_price_irr.tolist()
         )
-
-    return results
+    ]
 
 
 __all__ = [
+    "BomArrays",
+    "build_bom_arrays",
     "compute_cost_breakdown",
     "compute_recommended_price",
     "merge_cost_plus_and_ml_price",
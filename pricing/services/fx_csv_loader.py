@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import csv
 import datetime as dt
+import io
 from dataclasses import dataclass
-from typing import IO, List
+from operator import attrgetter
+from typing import IO, Iterable, List
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FxHistoryPoint:
     date: dt.date
     rate: float  # IRR per USD
@@ -19,6 +21,18 @@ class FxCsvError(Exception):
     pass
 
 
+def _text_lines(file_obj: IO) -> Iterable[str]:
+    """Return an iterable of text lines without buffering the whole file."""
+    if isinstance(file_obj, io.TextIOBase):
+        return file_obj
+    if hasattr(file_obj, "read"):
+        if isinstance(file_obj.read(0), bytes):
+            return io.TextIOWrapper(file_obj, encoding="utf-8", newline="")
+        return file_obj
+    text = file_obj.decode("utf-8") if isinstance(file_obj, bytes) else str(file_obj)
+    return text.splitlines()
+
+
 def load_fx_history_from_csv(file_obj: IO) -> List[FxHistoryPoint]:
     """
     Parse a CSV file with historical FX rates.
@@ -29,26 +43,28 @@ def load_fx_history_from_csv(file_obj: IO) -> List[FxHistoryPoint]:
 
     Returns a list of FxHistoryPoint sorted by date ascending.
     """
-    raw = file_obj.read()
-    if isinstance(raw, bytes):
-        text = raw.decode("utf-8")
-    else:
-        text = str(raw)
+    reader = csv.reader(_text_lines(file_obj))
 
-    reader = csv.DictReader(text.splitlines())
+    header = next(reader, None)
+    column_index = {name.strip(): i for i, name in enumerate(header or [])}
     required = {"date", "usd_irr"}
-    if not required.issubset(set(reader.fieldnames or [])):
-        missing = required - set(reader.fieldnames or [])
+    if not required.issubset(column_index):
+        missing = required - column_index.keys()
         raise FxCsvError(f"Missing required columns in FX CSV: {', '.join(sorted(missing))}")
 
+    date_idx = column_index["date"]
+    rate_idx = column_index["usd_irr"]
+
     points: List[FxHistoryPoint] = []
     for row in reader:
+        if not row:
+            continue
         try:
-            date_str = row["date"].strip()
-            rate_str = row["usd_irr"].strip()
-            date = dt.datetime.strptime(date_str, "%Y-%m-%d").date()
+            date_str = row[date_idx].strip()
+            rate_str = row[rate_idx].strip()
+            date = dt.date.fromisoformat(date_str)
             rate = float(rate_str)
-        except Exception as exc:  # ValueError, KeyError, etc.
+        except Exception as exc:  # ValueError, IndexError, etc.
             raise FxCsvError(f"Invalid FX row: {row}") from exc
 
         if rate <= 0:
@@ -56,7 +72,7 @@ def load_fx_history_from_csv(file_obj: IO) -> List[FxHistoryPoint]:
 
         points.append(FxHistoryPoint(date=date, rate=rate))
 
-    points.sort(key=lambda p: p.date)
+    points.sort(key=attrgetter("date"))
     if len(points) < 5:
         raise FxCsvError("FX CSV must contain at least 5 data points.")
     return points
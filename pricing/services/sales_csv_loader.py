@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import csv
+import io
+import sys
 from dataclasses import dataclass
-from typing import Dict, IO, List
+from typing import Dict, IO, Iterable, List
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SalesRecord:
     month: str          # e.g. "2024-01"
     product_code: str
@@ -18,6 +20,18 @@ class SalesCsvError(Exception):
     pass
 
 
+def _text_lines(file_obj: IO) -> Iterable[str]:
+    """Return an iterable of text lines without buffering the whole file."""
+    if isinstance(file_obj, io.TextIOBase):
+        return file_obj
+    if hasattr(file_obj, "read"):
+        if isinstance(file_obj.read(0), bytes):
+            return io.TextIOWrapper(file_obj, encoding="utf-8", newline="")
+        return file_obj
+    text = file_obj.decode("utf-8") if isinstance(file_obj, bytes) else file_obj
+    return text.splitlines()
+
+
 def load_sales_from_csv(file_obj: IO) -> Dict[str, List[SalesRecord]]:
     """
     Parse a sales CSV and return a mapping:
@@ -29,25 +43,33 @@ def load_sales_from_csv(file_obj: IO) -> Dict[str, List[SalesRecord]]:
     - price
     - units_sold
     """
-    text = file_obj.read().decode("utf-8") if hasattr(file_obj, "read") else file_obj
-    if isinstance(text, bytes):
-        text = text.decode("utf-8")
+    reader = csv.reader(_text_lines(file_obj))
 
-    reader = csv.DictReader(text.splitlines())
+    header = next(reader, None)
+    column_index = {name.strip(): i for i, name in enumerate(header or [])}
     required_cols = {"month", "product_code", "price", "units_sold"}
-    if not required_cols.issubset(reader.fieldnames or []):
-        missing = required_cols - set(reader.fieldnames or [])
+    if not required_cols.issubset(column_index):
+        missing = required_cols - column_index.keys()
         raise SalesCsvError(f"Missing required columns in sales CSV: {', '.join(sorted(missing))}")
 
+    month_idx = column_index["month"]
+    code_idx = column_index["product_code"]
+    price_idx = column_index["price"]
+    units_idx = column_index["units_sold"]
+
     mapping: Dict[str, List[SalesRecord]] = {}
 
     for row in reader:
+        if not row:
+            continue
         try:
-            month = row["month"].strip()
-            product_code = row["product_code"].strip()
-            price = int(row["price"])
-            units_sold = int(row["units_sold"])
-        except (KeyError, ValueError) as exc:
+            month = row[month_idx].strip()
+            # Interned: the same code repeats on most rows, and the groupby
+            # below keys a dict on it.
+            product_code = sys.intern(row[code_idx].strip())
+            price = int(row[price_idx])
+            units_sold = int(row[units_idx])
+        except (IndexError, ValueError) as exc:
             raise SalesCsvError(f"Invalid row in sales CSV: {row}") from exc
 
         if price < 0 or units_sold < 0:
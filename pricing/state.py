@@ -1,18 +1,45 @@
 """Simple in-memory storage for BOM data."""
 from __future__ import annotations
 
+import functools
 from typing import Dict, List
 
-from .domain_models import BomItem
+from .domain_models import (
+    BomItem,
+    CostBreakdown,
+    InventoryParams,
+    LogisticsParams,
+    ManufacturingParams,
+)
+from .pricing_engine import BomArrays, build_bom_arrays, compute_cost_breakdown
 
-# Maps product codes to lists of BOM items
+# Maps product codes to lists of BOM items. Rebound wholesale on upload
+# (never mutated in place) so concurrent readers always see a consistent
+# snapshot without locking.
 BOM_STORE: Dict[str, List[BomItem]] = {}
 
+# Struct-of-arrays companion to BOM_STORE, built once per upload so the
+# pricing engine gets contiguous buffers without re-traversing BomItem lists.
+BOM_ARRAYS: Dict[str, BomArrays] = {}
+
+# Sorted snapshot of the product codes, rebuilt on upload so per-request
+# template context does not re-sort the catalog.
+_SORTED_PRODUCT_CODES: tuple[str, ...] = ()
+
 
 def set_bom_store(mapping: Dict[str, List[BomItem]]) -> None:
     """Replace the in-memory BOM store with the given mapping."""
-    BOM_STORE.clear()
-    BOM_STORE.update(mapping)
+    global BOM_STORE, BOM_ARRAYS, _SORTED_PRODUCT_CODES
+
+    new_store = dict(mapping)
+    new_arrays = {code: build_bom_arrays(items) for code, items in new_store.items()}
+
+    # Each rebind is atomic; in-flight requests keep whichever snapshot
+    # they already captured.
+    BOM_STORE = new_store
+    BOM_ARRAYS = new_arrays
+    _SORTED_PRODUCT_CODES = tuple(sorted(new_store))
+    get_cost_breakdown_for_product.cache_clear()
 
 
 def get_bom_for_product(product_code: str) -> list[BomItem] | None:
@@ -20,6 +47,32 @@ def get_bom_for_product(product_code: str) -> list[BomItem] | None:
     return BOM_STORE.get(product_code)
 
 
+def get_bom_arrays(product_code: str) -> BomArrays | None:
+    """Return the cached array form of a product's BOM, or None if missing."""
+    return BOM_ARRAYS.get(product_code)
+
+
+@functools.lru_cache(maxsize=256)
+def get_cost_breakdown_for_product(
+    product_code: str,
+    manufacturing: ManufacturingParams,
+    logistics: LogisticsParams,
+    inventory: InventoryParams,
+) -> CostBreakdown:
+    """Memoized cost breakdown for a stored product.
+
+    Repeated form submits with unchanged parameters hit the cache instead
+    of re-running the engine; set_bom_store clears it on upload.
+    """
+    bom_items = BOM_ARRAYS.get(product_code) or BOM_STORE.get(product_code, [])
+    return compute_cost_breakdown(
+        bom_items=bom_items,
+        manufacturing=manufacturing,
+        logistics=logistics,
+        inventory=inventory,
+    )
+
+
 def get_all_product_codes() -> list[str]:
     """Return all known product codes, sorted."""
-    return sorted(BOM_STORE.keys())
+    return list(_SORTED_PRODUCT_CODES)
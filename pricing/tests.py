@@ -1,5 +1,4 @@
 import io
-import io
 
 from django.test import TestCase
 
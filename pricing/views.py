@@ -1,4 +1,3 @@
-from collections import defaultdict
 import json
 from typing import List
 
@@ -20,19 +19,103 @@ from .ml.demand_elasticity import (
 )
 from .ml.fx_forecast import FxForecastResult, forecast_fx
 from .pricing_engine import (
-    compute_cost_breakdown,
     compute_recommended_price,
     simulate_prices_for_exchange_rates,
 )
 from .services.fx_csv_loader import FxCsvError, load_fx_history_from_csv
 from .services.sales_csv_loader import SalesCsvError, load_sales_from_csv
-from .state import BOM_STORE, get_all_product_codes, get_bom_for_product, set_bom_store
+from .state import (
+    get_all_product_codes,
+    get_bom_arrays,
+    get_bom_for_product,
+    get_cost_breakdown_for_product,
+    set_bom_store,
+)
 
 
 def home(request):
     return redirect("pricing_form")
 
 
+def _require_int(value: str | None, field_name: str) -> int:
+    if value is None or value == "":
+        raise ValueError(f"{field_name} is required.")
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{field_name} must be a whole number.") from exc
+
+
+def _require_float(value: str | None, field_name: str) -> float:
+    if value is None or value == "":
+        raise ValueError(f"{field_name} is required.")
+    try:
+        return float(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{field_name} must be a number.") from exc
+
+
+def _parse_pricing_params(
+    post,
+) -> tuple[ManufacturingParams, LogisticsParams, InventoryParams, FinanceParams]:
+    """Parse the pricing parameter fields shared by the form and scenario views.
+
+    Raises ValueError with a user-facing message on the first invalid field.
+    """
+    manufacturing = ManufacturingParams(
+        smd_cost_per_component=_require_int(
+            post.get("smd_cost_per_component"), "SMD cost per component"
+        ),
+        tht_cost_per_component=_require_int(
+            post.get("tht_cost_per_component"), "THT cost per component"
+        ),
+        assembly_time_min=_require_float(post.get("assembly_time_min"), "Assembly time"),
+        qc_test_time_min=_require_float(post.get("qc_test_time_min"), "QC/Test time"),
+        worker_hour_cost=_require_int(post.get("worker_hour_cost"), "Worker hour cost"),
+    )
+
+    logistics = LogisticsParams(
+        shipping_cost_usd=_require_float(post.get("shipping_cost_usd"), "Shipping cost"),
+        custom_clearance_irr=_require_int(
+            post.get("custom_clearance_irr"), "Custom clearance"
+        ),
+        duty_percent=_require_float(post.get("duty_percent"), "Duty percent"),
+        exchange_rate_buy=_require_int(post.get("exchange_rate_buy"), "Exchange rate buy"),
+    )
+
+    inventory = InventoryParams(
+        inventory_days=_require_int(post.get("inventory_days"), "Inventory days"),
+        capital_cost_rate=_require_float(post.get("capital_cost_rate"), "Capital cost rate"),
+    )
+
+    finance = FinanceParams(
+        exchange_rate_now=_require_int(post.get("exchange_rate_now"), "Exchange rate now"),
+        target_margin_percent=_require_float(
+            post.get("target_margin_percent"), "Target margin"
+        ),
+        competitor_price_avg=_require_int(
+            post.get("competitor_price_avg"), "Competitor price average"
+        ),
+    )
+
+    return manufacturing, logistics, inventory, finance
+
+
+def _parse_exchange_rates(raw_value: str | None) -> list[int]:
+    if raw_value is None or raw_value.strip() == "":
+        raise ValueError("Exchange rates are required.")
+
+    parts = [part for part in map(str.strip, raw_value.split(",")) if part]
+    if not parts:
+        raise ValueError("Please provide at least one exchange rate.")
+    try:
+        return [int(part) for part in parts]
+    except ValueError as exc:
+        raise ValueError(
+            "Exchange rates must be integers separated by commas."
+        ) from exc
+
+
 def bom_upload_view(request):
     context: dict[str, object] = {}
 
@@ -48,9 +131,9 @@ def bom_upload_view(request):
             except BomCsvError as exc:
                 messages.error(request, str(exc))
             else:
-                grouped_items: dict[str, list[BomItem]] = defaultdict(list)
+                grouped_items: dict[str, list[BomItem]] = {}
                 for item in bom_items:
-                    grouped_items[item.product_code].append(item)
+                    grouped_items.setdefault(item.product_code, []).append(item)
 
                 set_bom_store(grouped_items)
                 context["product_codes"] = get_all_product_codes()
@@ -65,97 +148,35 @@ def pricing_form_view(request):
         "form_values": {},
     }
 
-    def _require_int(value: str | None, field_name: str) -> int:
-        if value is None or value == "":
-            raise ValueError(f"{field_name} is required.")
-        try:
-            return int(value)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"{field_name} must be a whole number.") from exc
-
-    def _require_float(value: str | None, field_name: str) -> float:
-        if value is None or value == "":
-            raise ValueError(f"{field_name} is required.")
-        try:
-            return float(value)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"{field_name} must be a number.") from exc
-
     if request.method == "POST":
-        product_code = request.POST.get("product_code") or ""
-
-        try:
-            manufacturing_params = ManufacturingParams(
-                smd_cost_per_component=_require_int(
-                    request.POST.get("smd_cost_per_component"),
-                    "SMD cost per component",
-                ),
-                tht_cost_per_component=_require_int(
-                    request.POST.get("tht_cost_per_component"),
-                    "THT cost per component",
-                ),
-                assembly_time_min=_require_float(
-                    request.POST.get("assembly_time_min"), "Assembly time"
-                ),
-                qc_test_time_min=_require_float(
-                    request.POST.get("qc_test_time_min"), "QC/Test time"
-                ),
-                worker_hour_cost=_require_int(
-                    request.POST.get("worker_hour_cost"), "Worker hour cost"
-                ),
-            )
-
-            logistics_params = LogisticsParams(
-                shipping_cost_usd=_require_float(
-                    request.POST.get("shipping_cost_usd"), "Shipping cost"
-                ),
-                custom_clearance_irr=_require_int(
-                    request.POST.get("custom_clearance_irr"), "Custom clearance"
-                ),
-                duty_percent=_require_float(
-                    request.POST.get("duty_percent"), "Duty percent"
-                ),
-                exchange_rate_buy=_require_int(
-                    request.POST.get("exchange_rate_buy"), "Exchange rate buy"
-                ),
-            )
-
-            inventory_params = InventoryParams(
-                inventory_days=_require_int(
-                    request.POST.get("inventory_days"), "Inventory days"
-                ),
-                capital_cost_rate=_require_float(
-                    request.POST.get("capital_cost_rate"), "Capital cost rate"
-                ),
-            )
-
-            finance_params = FinanceParams(
-                exchange_rate_now=_require_int(
-                    request.POST.get("exchange_rate_now"), "Exchange rate now"
-                ),
-                target_margin_percent=_require_float(
-                    request.POST.get("target_margin_percent"), "Target margin"
-                ),
-                competitor_price_avg=_require_int(
-                    request.POST.get("competitor_price_avg"),
-                    "Competitor price average",
-                ),
+        # One plain-dict copy; QueryDict lookups are slower and the same
+        # values are read repeatedly below and echoed back to the template.
+        posted = request.POST.dict()
+        product_code = posted.get("product_code") or ""
+        context["form_values"] = posted
+
+        # Cheap product check first: a missing or unknown code rejects the
+        # request before the fifteen numeric fields are parsed.
+        if not product_code:
+            messages.error(request, "Please select a product code.")
+        elif get_bom_for_product(product_code) is None:
+            messages.error(
+                request,
+                "The selected product code is missing. Please upload the BOM first.",
             )
-        except ValueError as exc:
-            messages.error(request, str(exc))
         else:
-            if not product_code:
-                messages.error(request, "Please select a product code.")
-            elif product_code not in BOM_STORE:
-                messages.error(
-                    request,
-                    "The selected product code is missing. Please upload the BOM first.",
-                )
+            try:
+                (
+                    manufacturing_params,
+                    logistics_params,
+                    inventory_params,
+                    finance_params,
+                ) = _parse_pricing_params(posted)
+            except ValueError as exc:
+                messages.error(request, str(exc))
             else:
-                bom_items = BOM_STORE.get(product_code, [])
-
-                cost_breakdown = compute_cost_breakdown(
-                    bom_items=bom_items,
+                cost_breakdown = get_cost_breakdown_for_product(
+                    product_code,
                     manufacturing=manufacturing_params,
                     logistics=logistics_params,
                     inventory=inventory_params,
@@ -175,12 +196,9 @@ def pricing_form_view(request):
                         "total_cost": cost_breakdown.total_cost_irr,
                         "recommended_price": recommended_price["final_suggested_price"],
                         "recommended_price_details": recommended_price,
-                        "form_values": request.POST,
                     }
                 )
 
-        context.setdefault("form_values", request.POST)
-
     return render(request, "pricing/pricing_form.html", context)
 
 
@@ -192,116 +210,35 @@ def scenario_view(request):
         "exchange_rates_raw": "",
     }
 
-    def _require_int(value: str | None, field_name: str) -> int:
-        if value is None or value == "":
-            raise ValueError(f"{field_name} is required.")
-        try:
-            return int(value)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"{field_name} must be a whole number.") from exc
-
-    def _require_float(value: str | None, field_name: str) -> float:
-        if value is None or value == "":
-            raise ValueError(f"{field_name} is required.")
-        try:
-            return float(value)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"{field_name} must be a number.") from exc
-
-    def _parse_exchange_rates(raw_value: str | None) -> list[int]:
-        if raw_value is None or raw_value.strip() == "":
-            raise ValueError("Exchange rates are required.")
-
-        rates: list[int] = []
-        for part in raw_value.split(","):
-            part = part.strip()
-            if not part:
-                continue
-            try:
-                rates.append(int(part))
-            except ValueError as exc:  # noqa: PERF203
-                raise ValueError(
-                    "Exchange rates must be integers separated by commas."
-                ) from exc
-        if not rates:
-            raise ValueError("Please provide at least one exchange rate.")
-        return rates
-
     if request.method == "POST":
-        product_code = request.POST.get("product_code") or ""
-        exchange_rates_raw = request.POST.get("exchange_rates_raw") or ""
-
-        try:
-            manufacturing_params = ManufacturingParams(
-                smd_cost_per_component=_require_int(
-                    request.POST.get("smd_cost_per_component"),
-                    "SMD cost per component",
-                ),
-                tht_cost_per_component=_require_int(
-                    request.POST.get("tht_cost_per_component"),
-                    "THT cost per component",
-                ),
-                assembly_time_min=_require_float(
-                    request.POST.get("assembly_time_min"), "Assembly time"
-                ),
-                qc_test_time_min=_require_float(
-                    request.POST.get("qc_test_time_min"), "QC/Test time"
-                ),
-                worker_hour_cost=_require_int(
-                    request.POST.get("worker_hour_cost"), "Worker hour cost"
-                ),
-            )
-
-            logistics_params = LogisticsParams(
-                shipping_cost_usd=_require_float(
-                    request.POST.get("shipping_cost_usd"), "Shipping cost"
-                ),
-                custom_clearance_irr=_require_int(
-                    request.POST.get("custom_clearance_irr"), "Custom clearance"
-                ),
-                duty_percent=_require_float(
-                    request.POST.get("duty_percent"), "Duty percent"
-                ),
-                exchange_rate_buy=_require_int(
-                    request.POST.get("exchange_rate_buy"), "Exchange rate buy"
-                ),
-            )
-
-            inventory_params = InventoryParams(
-                inventory_days=_require_int(
-                    request.POST.get("inventory_days"), "Inventory days"
-                ),
-                capital_cost_rate=_require_float(
-                    request.POST.get("capital_cost_rate"), "Capital cost rate"
-                ),
-            )
+        posted = request.POST.dict()
+        product_code = posted.get("product_code") or ""
+        exchange_rates_raw = posted.get("exchange_rates_raw") or ""
+        context["form_values"] = posted
 
-            finance_params = FinanceParams(
-                exchange_rate_now=_require_int(
-                    request.POST.get("exchange_rate_now"), "Exchange rate now"
-                ),
-                target_margin_percent=_require_float(
-                    request.POST.get("target_margin_percent"), "Target margin"
-                ),
-                competitor_price_avg=_require_int(
-                    request.POST.get("competitor_price_avg"),
-                    "Competitor price average",
-                ),
+        # Cheap product check first: a missing or unknown code rejects the
+        # request before the fifteen numeric fields are parsed.
+        if not product_code:
+            messages.error(request, "Please select a product code.")
+        elif get_bom_for_product(product_code) is None:
+            messages.error(
+                request,
+                "The selected product code is missing. Please upload the BOM first.",
             )
-
-            exchange_rates = _parse_exchange_rates(exchange_rates_raw)
-        except ValueError as exc:
-            messages.error(request, str(exc))
         else:
-            if not product_code:
-                messages.error(request, "Please select a product code.")
-            elif product_code not in BOM_STORE:
-                messages.error(
-                    request,
-                    "The selected product code is missing. Please upload the BOM first.",
-                )
+            try:
+                (
+                    manufacturing_params,
+                    logistics_params,
+                    inventory_params,
+                    finance_params,
+                ) = _parse_pricing_params(posted)
+
+                exchange_rates = _parse_exchange_rates(exchange_rates_raw)
+            except ValueError as exc:
+                messages.error(request, str(exc))
             else:
-                bom_items = BOM_STORE.get(product_code, [])
+                bom_items = get_bom_arrays(product_code) or get_bom_for_product(product_code) or []
 
                 scenario_results = simulate_prices_for_exchange_rates(
                     bom_items=bom_items,
@@ -318,13 +255,10 @@ def scenario_view(request):
                     {
                         "selected_product_code": product_code,
                         "scenario_results": scenario_results,
-                        "form_values": request.POST,
                         "exchange_rates_raw": exchange_rates_raw,
                     }
                 )
 
-        context.setdefault("form_values", request.POST)
-
     return render(request, "pricing/scenario.html", context)
 
 
@@ -350,25 +284,16 @@ def ai_insights_view(request):
         "fx_chart_json": "{}",
     }
 
-    def _require_int(value: str | None, field_name: str) -> int:
-        if value is None or value == "":
-            raise ValueError(f"{field_name} is required.")
-        return int(value)
-
-    def _require_float(value: str | None, field_name: str) -> float:
-        if value is None or value == "":
-            raise ValueError(f"{field_name} is required.")
-        return float(value)
-
     if request.method == "POST":
-        product_code = request.POST.get("product_code") or ""
-        context["form_values"] = request.POST.copy()
+        posted = request.POST.dict()
+        product_code = posted.get("product_code") or ""
+        context["form_values"] = posted
         context["selected_product_code"] = product_code
 
-        use_regularization = request.POST.get("use_regularization") == "on"
+        use_regularization = posted.get("use_regularization") == "on"
         regularization_strength = 0.1
         elasticity_bounds = (-3.0, -0.3)
-        context["form_values"]["use_regularization"] = "on" if use_regularization else ""
+        posted["use_regularization"] = "on" if use_regularization else ""
 
         if not product_code:
             messages.error(request, "Please select a product code.")
@@ -383,69 +308,69 @@ def ai_insights_view(request):
                 try:
                     manufacturing_params = ManufacturingParams(
                         smd_cost_per_component=_require_int(
-                            request.POST.get("smd_cost_per_component"),
+                            posted.get("smd_cost_per_component"),
                             "SMD cost per component",
                         ),
                         tht_cost_per_component=_require_int(
-                            request.POST.get("tht_cost_per_component"),
+                            posted.get("tht_cost_per_component"),
                             "THT cost per component",
                         ),
                         assembly_time_min=_require_float(
-                            request.POST.get("assembly_time_min"), "Assembly time"
+                            posted.get("assembly_time_min"), "Assembly time"
                         ),
                         qc_test_time_min=_require_float(
-                            request.POST.get("qc_test_time_min"), "QC test time"
+                            posted.get("qc_test_time_min"), "QC test time"
                         ),
                         worker_hour_cost=_require_int(
-                            request.POST.get("worker_hour_cost"), "Worker hour cost"
+                            posted.get("worker_hour_cost"), "Worker hour cost"
                         ),
                     )
 
                     logistics_params = LogisticsParams(
                         shipping_cost_usd=_require_float(
-                            request.POST.get("shipping_cost_usd"),
+                            posted.get("shipping_cost_usd"),
                             "Shipping cost (USD)",
                         ),
                         custom_clearance_irr=_require_int(
-                            request.POST.get("custom_clearance_irr"),
+                            posted.get("custom_clearance_irr"),
                             "Custom clearance (IRR)",
                         ),
                         duty_percent=_require_float(
-                            request.POST.get("duty_percent"),
+                            posted.get("duty_percent"),
                             "Duty percent",
                         ),
                         exchange_rate_buy=_require_int(
-                            request.POST.get("exchange_rate_buy"),
+                            posted.get("exchange_rate_buy"),
                             "Exchange rate buy",
                         ),
                     )
 
                     inventory_params = InventoryParams(
                         inventory_days=_require_int(
-                            request.POST.get("inventory_days"), "Inventory days"
+                            posted.get("inventory_days"), "Inventory days"
                         ),
                         capital_cost_rate=_require_float(
-                            request.POST.get("capital_cost_rate"),
+                            posted.get("capital_cost_rate"),
                             "Capital cost rate",
                         ),
                     )
 
                     finance_params = FinanceParams(
                         exchange_rate_now=_require_int(
-                            request.POST.get("exchange_rate_now"),
+                            posted.get("exchange_rate_now"),
                             "Exchange rate now",
                         ),
                         target_margin_percent=_require_float(
-                            request.POST.get("target_margin_percent"),
+                            posted.get("target_margin_percent"),
                             "Target margin percent",
                         ),
                         competitor_price_avg=_require_int(
-                            request.POST.get("competitor_price_avg") or "0",
+                            posted.get("competitor_price_avg") or "0",
                             "Competitor price avg",
                         ),
                     )
 
-                    fx_horizon_str = request.POST.get("fx_forecast_days") or ""
+                    fx_horizon_str = posted.get("fx_forecast_days") or ""
                     try:
                         fx_horizon_days = int(fx_horizon_str) if fx_horizon_str else 0
                     except ValueError:
@@ -453,9 +378,11 @@ def ai_insights_view(request):
                 except ValueError as exc:
                     messages.error(request, str(exc))
                 else:
+                    bom_arrays = get_bom_arrays(product_code) or bom_items
+
                     # Base cost and cost-plus price
-                    cost_breakdown = compute_cost_breakdown(
-                        bom_items=bom_items,
+                    cost_breakdown = get_cost_breakdown_for_product(
+                        product_code,
                         manufacturing=manufacturing_params,
                         logistics=logistics_params,
                         inventory=inventory_params,
@@ -524,42 +451,36 @@ def ai_insights_view(request):
                                 fx_points, horizon_days=fx_horizon_days
                             )
 
-                            for date, rate, low, high in zip(
+                            # The per-day price at a forecast rate is exactly the
+                            # scenario sweep's math, so run one vectorized sweep
+                            # over the whole horizon instead of re-deriving the
+                            # cost breakdown per forecast day.
+                            future_rows = simulate_prices_for_exchange_rates(
+                                bom_items=bom_arrays,
+                                exchange_rates=fx_forecast_result.forecast_rates,
+                                manufacturing=manufacturing_params,
+                                logistics=logistics_params,
+                                inventory=inventory_params,
+                                finance=finance_params,
+                            )
+
+                            ml_optimal = (
+                                elasticity_result.optimal_price
+                                if elasticity_result is not None
+                                else None
+                            )
+
+                            for date, rate, low, high, row in zip(
                                 fx_forecast_result.forecast_dates,
                                 fx_forecast_result.forecast_rates,
                                 fx_forecast_result.forecast_low,
                                 fx_forecast_result.forecast_high,
+                                future_rows,
                             ):
-                                logistics_future = LogisticsParams(
-                                    shipping_cost_usd=logistics_params.shipping_cost_usd,
-                                    custom_clearance_irr=logistics_params.custom_clearance_irr,
-                                    duty_percent=logistics_params.duty_percent,
-                                    exchange_rate_buy=int(rate),
-                                )
-                                finance_future = FinanceParams(
-                                    exchange_rate_now=int(rate),
-                                    target_margin_percent=finance_params.target_margin_percent,
-                                    competitor_price_avg=finance_params.competitor_price_avg,
-                                )
-
-                                cb_future = compute_cost_breakdown(
-                                    bom_items=bom_items,
-                                    manufacturing=manufacturing_params,
-                                    logistics=logistics_future,
-                                    inventory=inventory_params,
-                                )
-                                base_price_future_details = compute_recommended_price(
-                                    cost_breakdown=cb_future,
-                                    finance=finance_future,
-                                )
-                                base_price_future = base_price_future_details.get(
-                                    "final_suggested_price", 0
-                                )
+                                base_price_future = row.recommended_price_irr
 
-                                if elasticity_result is not None:
-                                    final_future = (
-                                        base_price_future + elasticity_result.optimal_price
-                                    ) / 2.0
+                                if ml_optimal is not None:
+                                    final_future = (base_price_future + ml_optimal) / 2.0
                                 else:
                                     final_future = base_price_future
 
@@ -571,7 +492,7 @@ def ai_insights_view(request):
                                         "fx_high": high,
                                         "base_price": base_price_future,
                                         "final_price": final_future,
-                                        "total_cost": cb_future.total_cost_irr,
+                                        "total_cost": row.total_cost_irr,
                                     }
                                 )
 